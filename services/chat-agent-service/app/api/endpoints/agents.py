@@ -1,12 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from datetime import datetime
 import logging
+from types import MappingProxyType
 
-from fastapi import Request as FastAPIRequest
-import json
-from fastapi.encoders import jsonable_encoder
-from json.decoder import JSONDecodeError
-
+from app.api import errors
 from app.models.requests import StartAgentRequest, StopAgentRequest
 from app.models.responses import AgentStatusResponse
 from app.services.agent_manager import AgentManager
@@ -14,7 +12,13 @@ from app.services.agent_manager import AgentManager
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-def get_agent_manager(request: Request) -> AgentManager:
+_NO_ACTIVE_AGENT = MappingProxyType({
+    "success": True,
+    "agent_active": False,
+    "agent_participant_id": None
+})
+
+async def get_agent_manager(request: Request) -> AgentManager:
     if not hasattr(request.app.state, 'agent_manager'):
         raise HTTPException(
             status_code=500, 
@@ -28,51 +32,39 @@ async def start_agent(
     agent_manager: AgentManager = Depends(get_agent_manager)
 ):
     try:
-        if not isinstance(request, StartAgentRequest):
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": "Malformed JSON in request body.",
-                    "error_code": "INVALID_JSON"
-                }
-            )
-    except JSONDecodeError:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "message": "Malformed JSON in request body.",
-                "error_code": "INVALID_JSON"
-            }
-        )
-    try:
-        if not request.room_name or len(request.room_name.strip()) == 0:
+        clean_room_name = (request.room_name or "").strip()
+        if not clean_room_name:
             raise HTTPException(
                 status_code=400,
                 detail="Room name cannot be empty"
             )
         
-        try:
-            await agent_manager.livekit_client.get_room(request.room_name)
-        except ValueError:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Room '{request.room_name}' does not exist. Please create the room first."
-            )
+        # An agent that is already running needs no room lookup and no new token.
+        if agent_manager.active_agents.get(clean_room_name) is None:
+            try:
+                await agent_manager.livekit_client.get_room_cached(clean_room_name)
+            except ValueError:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Room '{clean_room_name}' does not exist. Please create the room first."
+                )
         
-        agent_info = await agent_manager.start_agent(request.room_name)
+        agent_info = await agent_manager.start_agent(clean_room_name)
         
-        return AgentStatusResponse(
-            success=True,
-            message=f"Agent started successfully in room {request.room_name}",
-            room_name=request.room_name,
-            agent_active=True,
-            agent_participant_id=agent_info.get("participant_id")
+        return ORJSONResponse(
+            content=AgentStatusResponse.model_construct(
+                success=True,
+                message=f"Agent started successfully in room {clean_room_name}",
+                room_name=clean_room_name,
+                agent_active=True,
+                agent_participant_id=agent_info.get("participant_id")
+            ).model_dump()
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error starting agent in room {request.room_name}: {str(e)}")
+        logger.error("Error starting agent in room %s: %s", request.room_name, e)
         raise HTTPException(
             status_code=500, 
             detail={
@@ -88,56 +80,41 @@ async def stop_agent(
     agent_manager: AgentManager = Depends(get_agent_manager)
 ):
     try:
-        if not request.room_name or len(request.room_name.strip()) == 0:
-            return JSONResponse(
+        clean_room_name = (request.room_name or "").strip()
+        if not clean_room_name:
+            return ORJSONResponse(
                 status_code=400,
-                content={
-                    "success": False,
-                    "message": "Room name cannot be empty",
-                    "error_code": "ROOM_NAME_REQUIRED",
-                    "room_name": request.room_name
-                }
+                content={**errors.ROOM_NAME_REQUIRED, "room_name": request.room_name}
             )
-        status = await agent_manager.get_agent_status(request.room_name)
+        status = await agent_manager.get_agent_status(clean_room_name)
         if not status.get("active", False):
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=200,
                 content={
-                    "success": True,
-                    "message": f"No active agent found in room {request.room_name}",
-                    "room_name": request.room_name,
-                    "agent_active": False,
-                    "agent_participant_id": None
+                    **_NO_ACTIVE_AGENT,
+                    "message": f"No active agent found in room {clean_room_name}",
+                    "room_name": clean_room_name
                 }
             )
-        await agent_manager.stop_agent(request.room_name)
-        return AgentStatusResponse(
-            success=True,
-            message=f"Agent stopped successfully in room {request.room_name}",
-            room_name=request.room_name,
-            agent_active=False
+        await agent_manager.stop_agent(clean_room_name)
+        return ORJSONResponse(
+            content=AgentStatusResponse.model_construct(
+                success=True,
+                message=f"Agent stopped successfully in room {clean_room_name}",
+                room_name=clean_room_name,
+                agent_active=False
+            ).model_dump()
         )
     except HTTPException as he:
-        return JSONResponse(
-            status_code=he.status_code,
-            content={
-                "success": False,
-                "message": he.detail if isinstance(he.detail, str) else he.detail.get("message", "HTTP error"),
-                "error_code": he.detail.get("error_code", "HTTP_ERROR") if isinstance(he.detail, dict) else "HTTP_ERROR",
-                "details": he.detail
-            }
-        )
+        return errors.http_exception_response(he)
     except Exception as e:
-        logger.error(f"Error stopping agent in room {request.room_name}: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to stop agent due to internal error",
-                "error_code": "AGENT_STOP_FAILED",
-                "room_name": request.room_name,
-                "details": str(e)
-            }
+        logger.error("Error stopping agent in room %s: %s", request.room_name, e)
+        return errors.error_response(
+            500,
+            "AGENT_STOP_FAILED",
+            "Failed to stop agent due to internal error",
+            room_name=request.room_name,
+            details=str(e)
         )
 
 @router.get("/status/{room_name}", response_model=AgentStatusResponse)
@@ -146,44 +123,31 @@ async def get_agent_status(
     agent_manager: AgentManager = Depends(get_agent_manager)
 ):
     try:
-        if not room_name or len(room_name.strip()) == 0:
-            return JSONResponse(
+        clean_room_name = (room_name or "").strip()
+        if not clean_room_name:
+            return ORJSONResponse(
                 status_code=400,
-                content={
-                    "success": False,
-                    "message": "Room name cannot be empty",
-                    "error_code": "ROOM_NAME_REQUIRED",
-                    "room_name": room_name
-                }
+                content={**errors.ROOM_NAME_REQUIRED, "room_name": room_name}
             )
-        status = await agent_manager.get_agent_status(room_name)
-        return AgentStatusResponse(
-            success=True,
-            message="Agent status retrieved successfully",
-            room_name=room_name,
-            agent_active=status.get("active", False),
-            agent_participant_id=status.get("participant_id"),
-            agent_connected=status.get("connected", False)
-        )
-    except HTTPException as he:
-        return JSONResponse(
-            status_code=he.status_code,
+        status = await agent_manager.get_agent_status(clean_room_name)
+        return ORJSONResponse(
             content={
-                "success": False,
-                "message": he.detail if isinstance(he.detail, str) else he.detail.get("message", "HTTP error"),
-                "error_code": he.detail.get("error_code", "HTTP_ERROR") if isinstance(he.detail, dict) else "HTTP_ERROR",
-                "details": he.detail
+                "success": True,
+                "message": "Agent status retrieved successfully",
+                "timestamp": datetime.now(),
+                "room_name": clean_room_name,
+                "agent_active": status.get("active", False),
+                "agent_participant_id": status.get("participant_id")
             }
         )
+    except HTTPException as he:
+        return errors.http_exception_response(he)
     except Exception as e:
-        logger.error(f"Error getting agent status for room {room_name}: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to get agent status",
-                "error_code": "AGENT_STATUS_FAILED",
-                "room_name": room_name,
-                "details": str(e)
-            }
+        logger.error("Error getting agent status for room %s: %s", room_name, e)
+        return errors.error_response(
+            500,
+            "AGENT_STATUS_FAILED",
+            "Failed to get agent status",
+            room_name=room_name,
+            details=str(e)
         )
\ No newline at end of file
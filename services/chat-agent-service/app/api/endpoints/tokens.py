@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from datetime import datetime, timedelta
 import logging
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
+from app.api import errors
 from app.models.requests import JoinRoomRequest
 from app.models.responses import TokenResponse
 from app.services.agent_manager import AgentManager
@@ -10,21 +11,7 @@ from app.services.agent_manager import AgentManager
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-def get_agent_manager(request: Request) -> AgentManager:
-    return request.app.state.agent_manager
-
-from fastapi import APIRouter, HTTPException, Depends, Request
-from datetime import datetime, timedelta
-import logging
-
-from app.models.requests import JoinRoomRequest
-from app.models.responses import TokenResponse
-from app.services.agent_manager import AgentManager
-
-router = APIRouter()
-logger = logging.getLogger(__name__)
-
-def get_agent_manager(request: Request) -> AgentManager:
+async def get_agent_manager(request: Request) -> AgentManager:
     if not hasattr(request.app.state, 'agent_manager'):
         raise HTTPException(
             status_code=500,
@@ -38,74 +25,53 @@ async def generate_token(
     agent_manager: AgentManager = Depends(get_agent_manager)
 ):
     try:
-        if not request.room_name or len(request.room_name.strip()) == 0:
-            return JSONResponse(
+        clean_room_name = (request.room_name or "").strip()
+        if not clean_room_name:
+            return ORJSONResponse(
                 status_code=400,
-                content={
-                    "success": False,
-                    "message": "Room name cannot be empty",
-                    "error_code": "ROOM_NAME_REQUIRED",
-                    "room_name": request.room_name
-                }
+                content={**errors.ROOM_NAME_REQUIRED, "room_name": request.room_name}
             )
-        if not request.username or len(request.username.strip()) == 0:
-            return JSONResponse(
+        if not request.username or not request.username.strip():
+            return ORJSONResponse(
                 status_code=400,
-                content={
-                    "success": False,
-                    "message": "Username cannot be empty",
-                    "error_code": "USERNAME_REQUIRED",
-                    "username": request.username
-                }
+                content={**errors.USERNAME_REQUIRED, "username": request.username}
             )
         try:
-            await agent_manager.livekit_client.get_room(request.room_name)
+            await agent_manager.livekit_client.get_room_cached(clean_room_name)
         except ValueError:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "success": False,
-                    "message": f"Room '{request.room_name}' does not exist",
-                    "error_code": "ROOM_NOT_FOUND",
-                    "room_name": request.room_name
-                }
+            return errors.error_response(
+                404,
+                "ROOM_NOT_FOUND",
+                f"Room '{clean_room_name}' does not exist",
+                room_name=clean_room_name
             )
         expires_at = datetime.now() + timedelta(hours=24)
         token = await agent_manager.livekit_client.generate_access_token(
-            room_name=request.room_name,
+            room_name=clean_room_name,
             username=request.username,
             metadata=request.metadata
         )
-        return TokenResponse(
-            success=True,
-            message="Access token generated successfully",
-            token=token,
-            room_name=request.room_name,
-            username=request.username,
-            expires_at=expires_at
+        return ORJSONResponse(
+            content=TokenResponse.model_construct(
+                success=True,
+                message="Access token generated successfully",
+                token=token,
+                room_name=clean_room_name,
+                username=request.username,
+                expires_at=expires_at
+            ).model_dump()
         )
     except HTTPException as he:
-        return JSONResponse(
-            status_code=he.status_code,
-            content={
-                "success": False,
-                "message": he.detail if isinstance(he.detail, str) else he.detail.get("message", "HTTP error"),
-                "error_code": he.detail.get("error_code", "HTTP_ERROR") if isinstance(he.detail, dict) else "HTTP_ERROR",
-                "details": he.detail
-            }
-        )
+        return errors.http_exception_response(he)
     except Exception as e:
-        logger.error(f"Error generating token for {request.username}: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to generate access token",
-                "error_code": "TOKEN_GENERATION_FAILED",
-                "username": request.username,
-                "room_name": request.room_name,
-                "details": str(e)
-            }
+        logger.error("Error generating token for %s: %s", request.username, e)
+        return errors.error_response(
+            500,
+            "TOKEN_GENERATION_FAILED",
+            "Failed to generate access token",
+            username=request.username,
+            room_name=request.room_name,
+            details=str(e)
         )
 
 @router.post("/validate")
@@ -122,23 +88,12 @@ async def validate_token(
             "timestamp": datetime.now()
         }
     except HTTPException as he:
-        return JSONResponse(
-            status_code=he.status_code,
-            content={
-                "success": False,
-                "message": he.detail if isinstance(he.detail, str) else he.detail.get("message", "HTTP error"),
-                "error_code": he.detail.get("error_code", "HTTP_ERROR") if isinstance(he.detail, dict) else "HTTP_ERROR",
-                "details": he.detail
-            }
-        )
+        return errors.http_exception_response(he)
     except Exception as e:
-        logger.error(f"Error validating token: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to validate token",
-                "error_code": "TOKEN_VALIDATION_FAILED",
-                "details": str(e)
-            }
+        logger.error("Error validating token: %s", e)
+        return errors.error_response(
+            500,
+            "TOKEN_VALIDATION_FAILED",
+            "Failed to validate token",
+            details=str(e)
         )
\ No newline at end of file
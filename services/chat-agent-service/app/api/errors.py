@@ -0,0 +1,62 @@
+from types import MappingProxyType
+
+import orjson
+from fastapi import HTTPException, Response
+
+ROOM_NAME_REQUIRED = MappingProxyType({
+    "success": False,
+    "message": "Room name cannot be empty",
+    "error_code": "ROOM_NAME_REQUIRED"
+})
+
+USERNAME_REQUIRED = MappingProxyType({
+    "success": False,
+    "message": "Username cannot be empty",
+    "error_code": "USERNAME_REQUIRED"
+})
+
+ROOM_CHECK_FAILED = orjson.dumps({
+    "success": False,
+    "message": "Failed to check room existence",
+    "error_code": "ROOM_CHECK_FAILED"
+})
+
+ROOM_CREATION_FAILED = orjson.dumps({
+    "success": False,
+    "message": "Failed to create room due to internal error",
+    "error_code": "ROOM_CREATION_FAILED",
+    "details": "Internal server error"
+})
+
+ROOM_NOT_FOUND = orjson.dumps({
+    "success": False,
+    "message": "Room not found",
+    "error_code": "ROOM_NOT_FOUND",
+    "details": "Room does not exist"
+})
+
+ROOM_DELETE_FAILED = orjson.dumps({
+    "success": False,
+    "message": "Failed to delete room",
+    "error_code": "ROOM_DELETE_FAILED",
+    "details": "Internal server error"
+})
+
+def cached_error_response(body: bytes, status_code: int) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+def error_response(status_code: int, error_code: str, message: str, **extra) -> Response:
+    return Response(
+        content=orjson.dumps({"success": False, "message": message, "error_code": error_code, **extra}),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+def http_exception_response(he: HTTPException) -> Response:
+    detail = he.detail if isinstance(he.detail, dict) else {"message": he.detail}
+    return error_response(
+        he.status_code,
+        detail.get("error_code", "HTTP_ERROR"),
+        detail.get("message", "HTTP error"),
+        details=he.detail
+    )
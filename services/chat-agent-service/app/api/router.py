@@ -1,7 +1,8 @@
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from app.api.endpoints import rooms, agents, tokens
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 api_router.include_router(rooms.router, prefix="/rooms", tags=["rooms"])
 api_router.include_router(agents.router, prefix="/agents", tags=["agents"])
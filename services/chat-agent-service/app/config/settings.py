@@ -1,4 +1,5 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 import os
 
@@ -12,6 +13,8 @@ class Settings(BaseSettings):
     
     MEMORY_SERVICE_URL: str = "http://localhost:8001"
     
+    REDIS_URL: Optional[str] = None
+    
     HOST: str = "0.0.0.0"
     PORT: int = 8002
     ENVIRONMENT: str = "development"
@@ -20,8 +23,14 @@ class Settings(BaseSettings):
     MAX_CONTEXT_LENGTH: int = 4000
     TEMPERATURE: float = 0.7
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        frozen=True
+    )
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
@@ -1,9 +1,16 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from typing import Dict, Tuple
 import logging
 import time
+import uuid
+
+import orjson
+import redis.asyncio as redis
+from redis.exceptions import RedisError
 
 from app.api.router import api_router
 from app.config.settings import settings
@@ -14,7 +21,33 @@ logger = logging.getLogger(__name__)
 
 agent_manager = None
 
-rate_limit_storage = {}
+MAX_REQUEST_SIZE = 1024 * 10
+
+RATE_LIMIT_MAX_REQUESTS = 100
+RATE_LIMIT_WINDOW = 60
+
+# Sliding-window log: drop entries older than the window, then admit the
+# request only if the remaining count is below the limit.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    return count + 1
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('EXPIRE', key, window)
+return count + 1
+"""
+
+rate_limit_redis = redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+sliding_window = rate_limit_redis.register_script(SLIDING_WINDOW_SCRIPT) if rate_limit_redis else None
+
+rate_limit_storage: Dict[Tuple[str, int], int] = {}
+rate_limit_bucket = 0
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -31,66 +64,125 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down LiveKit Chat Agent Service...")
     if agent_manager:
         await agent_manager.cleanup()
+    if rate_limit_redis:
+        await rate_limit_redis.aclose()
 
 app = FastAPI(
     title="LiveKit Chat Agent Service",
     description="Real-time AI chat agent with memory-enhanced conversations",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-async def validate_request_size(request: Request):
-    """Check request size before processing"""
-    content_length = request.headers.get('content-length')
-    max_size = 1024 * 10 
+class RequestSizeLimitMiddleware:
+    def __init__(self, app, max_size: int = MAX_REQUEST_SIZE):
+        self.app = app
+        self.max_size = max_size
+        self.body = orjson.dumps({
+            "success": False,
+            "message": f"Request body too large. Maximum size allowed: {max_size} bytes",
+            "error_code": "REQUEST_TOO_LARGE",
+            "max_size": max_size
+        })
+        self.headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self.body)).encode())
+        ]
     
-    if content_length and int(content_length) > max_size:
-        logger.warning(f"Request too large from {request.client.host}: {content_length} bytes")
-        raise HTTPException(
-            status_code=413,
-            detail={
-                "success": False,
-                "message": f"Request body too large. Maximum size allowed: {max_size} bytes",
-                "error_code": "REQUEST_TOO_LARGE",
-                "max_size": max_size
-            }
-        )
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_size:
+                        client = scope.get("client")
+                        logger.warning("Request too large from %s: %s bytes", client[0] if client else "unknown", value.decode())
+                        await send({"type": "http.response.start", "status": 413, "headers": self.headers})
+                        await send({"type": "http.response.body", "body": self.body})
+                        return
+                    break
+        
+        await self.app(scope, receive, send)
 
-async def check_rate_limit(request: Request):
-    global rate_limit_storage
+class PermissiveCORS:
+    preflight_headers = [
+        (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+        (b"access-control-max-age", b"600"),
+        (b"content-type", b"text/plain; charset=utf-8"),
+        (b"content-length", b"2")
+    ]
     
-    if request.url.path == "/health":
-        return
+    def __init__(self, app):
+        self.app = app
     
-    client_ip = request.client.host
-    current_time = time.time()
-    max_requests = 100
-    window = 60  
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+        
+        # Any origin is allowed, so credentials are not; browsers reject "*" with them.
+        cors_headers = [(b"access-control-allow-origin", b"*")]
+        
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            if request_headers:
+                cors_headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": cors_headers + self.preflight_headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+        
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+
+app.add_middleware(RequestSizeLimitMiddleware)
+app.add_middleware(PermissiveCORS)
+
+async def check_rate_limit(request: Request):
+    global rate_limit_bucket
     
-    rate_limit_storage = {
-        ip: requests for ip, requests in rate_limit_storage.items()
-        if any(req_time > current_time - window for req_time in requests)
-    }
+    client_ip = request.client.host if request.client else "unknown"
+    max_requests = RATE_LIMIT_MAX_REQUESTS
+    window = RATE_LIMIT_WINDOW
     
-    if client_ip not in rate_limit_storage:
-        rate_limit_storage[client_ip] = []
+    count = None
+    if sliding_window is not None:
+        try:
+            count = await sliding_window(
+                keys=[f"rl:{client_ip}"],
+                args=[time.time(), window, max_requests, uuid.uuid4().hex]
+            )
+        except (RedisError, OSError) as e:
+            # Fail open onto the local counter rather than failing every API route.
+            logger.warning("Rate limit store unavailable, using in-process counter: %s", e)
     
-    rate_limit_storage[client_ip] = [
-        req_time for req_time in rate_limit_storage[client_ip]
-        if req_time > current_time - window
-    ]
+    if count is None:
+        bucket = time.monotonic_ns() // 1_000_000_000 // window
+        if bucket != rate_limit_bucket:
+            for key in [key for key in rate_limit_storage if key[1] < bucket]:
+                del rate_limit_storage[key]
+            rate_limit_bucket = bucket
+        count = rate_limit_storage.get((client_ip, bucket), 0) + 1
+        if count <= max_requests:
+            rate_limit_storage[(client_ip, bucket)] = count
     
-    if len(rate_limit_storage[client_ip]) >= max_requests:
-        logger.warning(f"Rate limit exceeded for {client_ip}: {len(rate_limit_storage[client_ip])} requests")
+    if count > max_requests:
+        logger.warning("Rate limit exceeded for %s: %d requests", client_ip, count - 1)
         raise HTTPException(
             status_code=429,
             detail={
@@ -100,10 +192,8 @@ async def check_rate_limit(request: Request):
                 "retry_after": window
             }
         )
-    
-    rate_limit_storage[client_ip].append(current_time)
 
-app.include_router(api_router, prefix="/api/v1")
+app.include_router(api_router, prefix="/api/v1", dependencies=[Depends(check_rate_limit)])
 
 @app.get("/health")
 async def health_check():
@@ -113,22 +203,22 @@ async def health_check():
         "version": "1.0.0"
     }
 
-@app.exception_handler(422)
-async def validation_exception_handler(request: Request, exc):
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
     logger.warning(f"Validation error from {request.client.host}: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "success": False,
             "message": "Invalid request data",
             "error_code": "VALIDATION_ERROR",
-            "details": exc.errors() if hasattr(exc, 'errors') else str(exc)
+            "details": jsonable_encoder(exc.errors())
         }
     )
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=exc.detail if isinstance(exc.detail, dict) else {
             "success": False,
@@ -140,7 +230,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(500)
 async def internal_server_error_handler(request: Request, exc):
     logger.error(f"Internal server error from {request.client.host}: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -155,5 +245,7 @@ if __name__ == "__main__":
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
+        loop="uvloop",
+        http="httptools",
         reload=settings.ENVIRONMENT == "development"
     )
\ No newline at end of file
@@ -1,11 +1,34 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field, StringConstraints, field_validator
+from typing import Optional, Dict, Any, Annotated
+
+MAX_ROOM_NAME_LENGTH = 100
+MIN_ROOM_NAME_LENGTH = 1
+MAX_PARTICIPANTS = 1000
+MIN_PARTICIPANTS = 1
+MAX_EMPTY_TIMEOUT = 86400
+MIN_EMPTY_TIMEOUT = 10
+MAX_METADATA_SIZE = 1024
+
+RoomName = Annotated[str, StringConstraints(
+    strip_whitespace=True,
+    min_length=MIN_ROOM_NAME_LENGTH,
+    max_length=MAX_ROOM_NAME_LENGTH,
+    # ASCII whitespace only, matching validate_room_name; "\s" is Unicode-aware here.
+    pattern=r"^[a-zA-Z0-9\-_ \t\n\r\x0b\x0c]+$"
+)]
 
 class CreateRoomRequest(BaseModel):
-    room_name: str = Field(..., description="Name of the room to create")
-    max_participants: Optional[int] = Field(default=10, description="Maximum number of participants")
-    empty_timeout: Optional[int] = Field(default=300, description="Timeout in seconds when room is empty")
+    room_name: RoomName = Field(..., description="Name of the room to create")
+    max_participants: int = Field(default=10, ge=MIN_PARTICIPANTS, le=MAX_PARTICIPANTS, description="Maximum number of participants")
+    empty_timeout: int = Field(default=300, ge=MIN_EMPTY_TIMEOUT, le=MAX_EMPTY_TIMEOUT, description="Timeout in seconds when room is empty")
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Optional metadata for the room")
+    
+    @field_validator("metadata")
+    @classmethod
+    def validate_metadata(cls, v: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if v is not None and len(str(v)) > MAX_METADATA_SIZE:
+            raise ValueError(f"Metadata size cannot exceed {MAX_METADATA_SIZE} characters")
+        return v
 
 class JoinRoomRequest(BaseModel):
     room_name: str = Field(..., description="Name of the room to join")
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 class BaseResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     success: bool
     message: str
     timestamp: datetime = Field(default_factory=datetime.now)
@@ -35,6 +37,8 @@ class RoomListResponse(BaseResponse):
     total_count: int
 
 class ErrorResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     success: bool = False
     error: str
     error_code: Optional[str] = None
@@ -1,21 +1,36 @@
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from contextlib import asynccontextmanager
 
+import httpx
+
 from app.services.livekit_client import LiveKitClient
-from app.services.memory_client import MemoryClient
+from app.services.memory_client import MemoryClient, MemoryWrite
 from app.services.llm_client import LLMClient
 from app.services.chat_agent import ChatAgent
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+MEMORY_QUEUE_SIZE = 1000
+MEMORY_BATCH_SIZE = 32
+MEMORY_FLUSH_INTERVAL = 0.05
+MEMORY_SHUTDOWN_TIMEOUT = 10.0
+
 class AgentManager:
     def __init__(self):
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=60)
+        )
         self.livekit_client = LiveKitClient()
-        self.memory_client = MemoryClient()
-        self.llm_client = LLMClient()
+        self.memory_client = MemoryClient(http_client=self.http_client)
+        self.llm_client = LLMClient(http_client=self.http_client)
+        
+        self.memory_queue: asyncio.Queue = asyncio.Queue(maxsize=MEMORY_QUEUE_SIZE)
+        self._memory_writer: Optional[asyncio.Task] = None
         
         self.active_agents: Dict[str, ChatAgent] = {}
         self._initialized = False
@@ -27,10 +42,15 @@ class AgentManager:
         logger.info("Initializing Agent Manager...")
         
         try:
+            self.livekit_client.warm_up_token_signing()
+            
             memory_healthy = await self.memory_client.health_check()
             if not memory_healthy:
                 logger.warning("Memory service is not healthy")
             
+            self._memory_writer = asyncio.create_task(self._drain_memory_queue())
+            self._memory_writer.add_done_callback(self._on_memory_writer_done)
+            
             logger.info("Agent Manager initialized successfully")
             self._initialized = True
             
@@ -41,31 +61,74 @@ class AgentManager:
     async def cleanup(self):
         logger.info("Cleaning up Agent Manager...")
         
-        for room_name in list(self.active_agents.keys()):
+        async with asyncio.TaskGroup() as tg:
+            for room_name in list(self.active_agents):
+                tg.create_task(self._safe_stop(room_name))
+        
+        if self._memory_writer:
             try:
-                await self.stop_agent(room_name)
-            except Exception as e:
-                logger.error(f"Error stopping agent in room {room_name}: {str(e)}")
+                await asyncio.wait_for(self.memory_queue.join(), MEMORY_SHUTDOWN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Dropping {self.memory_queue.qsize()} pending memory writes on shutdown")
+            self._memory_writer.cancel()
+            self._memory_writer = None
         
         await self.memory_client.close()
+        await self.livekit_client.close()
+        await self.http_client.aclose()
         
         logger.info("Agent Manager cleanup completed")
     
+    async def _drain_memory_queue(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[MemoryWrite] = [await self.memory_queue.get()]
+            deadline = loop.time() + MEMORY_FLUSH_INTERVAL
+            while len(batch) < MEMORY_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.memory_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            await self.memory_client.add_memory_bulk(batch)
+            for _ in batch:
+                self.memory_queue.task_done()
+    
+    def _on_memory_writer_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Memory writer stopped unexpectedly: {task.exception()}")
+    
+    async def _safe_stop(self, room_name: str):
+        try:
+            await self.stop_agent(room_name)
+        except Exception as e:
+            logger.error(f"Error stopping agent in room {room_name}: {str(e)}")
+    
+    async def prepare_agent(self, room_name: str) -> ChatAgent:
+        agent = ChatAgent(
+            room_name=room_name,
+            livekit_client=self.livekit_client,
+            memory_client=self.memory_client,
+            llm_client=self.llm_client,
+            memory_queue=self.memory_queue
+        )
+        await agent.prepare()
+        return agent
+    
     async def start_agent(self, room_name: str) -> Dict[str, Any]:
-        if room_name in self.active_agents:
+        active_agent = self.active_agents.get(room_name)
+        if active_agent is not None:
             logger.warning(f"Agent already active in room {room_name}")
             return {
-                "participant_id": self.active_agents[room_name].participant_id,
+                "participant_id": active_agent.participant_id,
                 "status": "already_active"
             }
         
         try:
-            agent = ChatAgent(
-                room_name=room_name,
-                livekit_client=self.livekit_client,
-                memory_client=self.memory_client,
-                llm_client=self.llm_client
-            )
+            agent = await self.prepare_agent(room_name)
             
             await agent.start()
             
@@ -82,16 +145,14 @@ class AgentManager:
             raise
     
     async def stop_agent(self, room_name: str):
-        if room_name not in self.active_agents:
+        agent = self.active_agents.pop(room_name, None)
+        if agent is None:
             logger.warning(f"No active agent in room {room_name}")
             return
         
         try:
-            agent = self.active_agents[room_name]
             await agent.stop()
             
-            del self.active_agents[room_name]
-            
             logger.info(f"Stopped agent in room {room_name}")
             
         except Exception as e:
@@ -99,8 +160,8 @@ class AgentManager:
             raise
     
     async def get_agent_status(self, room_name: str) -> Dict[str, Any]:
-        if room_name in self.active_agents:
-            agent = self.active_agents[room_name]
+        agent = self.active_agents.get(room_name)
+        if agent is not None:
             return {
                 "active": True,
                 "participant_id": agent.participant_id,
@@ -1,40 +1,69 @@
 import asyncio
 import logging
-import json
-from typing import Dict, Any, Optional, List
+import uuid
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Any, Optional
 from datetime import datetime
 
+import orjson
 from livekit import rtc
 from livekit.rtc import Room, DataPacket
 
 from app.services.livekit_client import LiveKitClient
-from app.services.memory_client import MemoryClient
+from app.services.memory_client import MemoryClient, MemoryWrite
 from app.services.llm_client import LLMClient
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+HISTORY_MAXLEN = 12
+RECENT_HISTORY_TURNS = 6
+
+ROLE_USER = "user"
+ROLE_ASSISTANT = "assistant"
+TYPE_USER_MESSAGE = "user_message"
+TYPE_AI_RESPONSE = "ai_response"
+
+# Streamed tokens are sent in chunks: whichever of these limits is reached first.
+DELTA_FLUSH_INTERVAL = 0.05
+DELTA_FLUSH_CHARS = 64
+
 class ChatAgent:
     def __init__(
         self, 
         room_name: str,
         livekit_client: LiveKitClient,
         memory_client: MemoryClient,
-        llm_client: LLMClient
+        llm_client: LLMClient,
+        memory_queue: asyncio.Queue
     ):
         self.room_name = room_name
         self.livekit_client = livekit_client
         self.memory_client = memory_client
         self.llm_client = llm_client
+        self.memory_queue = memory_queue
         
         self.agent_name = settings.AGENT_NAME
         self.agent_username = f"{self.agent_name.lower().replace(' ', '_')}_agent"
+        self._system_prompt = llm_client.get_system_prompt(self.agent_name)
+        self._packet_sender = b',"sender":' + orjson.dumps(self.agent_username) + b',"timestamp":'
         
         self.room: Optional[Room] = None
         self.participant_id: Optional[str] = None
+        self._token: Optional[str] = None
         self._running = False
+        self._connected = False
         
-        self.conversation_history: Dict[str, List[Dict[str, Any]]] = {}
+        self.conversation_history: Dict[str, Deque[Dict[str, str]]] = {}
+    
+    async def prepare(self):
+        if self._token is None:
+            self._token = await self.livekit_client.generate_access_token(
+                room_name=self.room_name,
+                username=self.agent_username,
+                metadata={"type": "ai_agent", "name": self.agent_name}
+            )
     
     async def start(self):
         if self._running:
@@ -44,18 +73,15 @@ class ChatAgent:
         try:
             logger.info(f"Starting chat agent in room {self.room_name}")
             
-            token = await self.livekit_client.generate_access_token(
-                room_name=self.room_name,
-                username=self.agent_username,
-                metadata={"type": "ai_agent", "name": self.agent_name}
-            )
+            await self.prepare()
             
             self.room = rtc.Room()
             
             self._setup_event_handlers()
             
-            await self.room.connect(settings.LIVEKIT_URL, token)
+            await self.room.connect(settings.LIVEKIT_URL, self._token)
             
+            self._connected = True
             self._running = True
             logger.info(f"Chat agent connected to room {self.room_name}")
             
@@ -73,9 +99,10 @@ class ChatAgent:
         await self._cleanup()
     
     def is_connected(self) -> bool:
-        return self.room is not None and self.room.connection_state == rtc.ConnectionState.CONN_CONNECTED
+        return self._connected and self.room is not None
     
     async def _cleanup(self):
+        self._connected = False
         if self.room:
             await self.room.disconnect()
             self.room = None
@@ -86,13 +113,23 @@ class ChatAgent:
         @self.room.on("connected")
         def on_connected():
             logger.info(f"Agent connected to room {self.room_name}")
+            self._connected = True
             self.participant_id = self.room.local_participant.sid
         
         @self.room.on("disconnected")
         def on_disconnected():
             logger.info(f"Agent disconnected from room {self.room_name}")
+            self._connected = False
             self._running = False
         
+        @self.room.on("reconnecting")
+        def on_reconnecting():
+            self._connected = False
+        
+        @self.room.on("reconnected")
+        def on_reconnected():
+            self._connected = True
+        
         @self.room.on("participant_connected")
         def on_participant_connected(participant: rtc.RemoteParticipant):
             logger.info(f"Participant {participant.identity} joined room {self.room_name}")
@@ -112,16 +149,14 @@ class ChatAgent:
             
             if memories:
                 context = await self.llm_client.generate_context_summary(memories)
-                system_prompt = self.llm_client.get_system_prompt(self.agent_name)
-                
                 messages = [{
-                    "role": "user", 
+                    "role": ROLE_USER, 
                     "content": f"A user named {username} just joined the chat room. Greet them warmly and reference something from your previous conversations if appropriate."
                 }]
                 
                 greeting = await self.llm_client.generate_response(
                     messages=messages,
-                    system_prompt=system_prompt,
+                    system_prompt=self._system_prompt,
                     context=context
                 )
             else:
@@ -138,7 +173,7 @@ class ChatAgent:
             if participant.identity == self.agent_username:
                 return
             
-            message_data = json.loads(data.data.decode('utf-8'))
+            message_data = orjson.loads(data.data)
             message_text = message_data.get('message', '').strip()
             username = participant.identity
             
@@ -147,50 +182,50 @@ class ChatAgent:
             
             logger.info(f"Received message from {username}: {message_text}")
             
-            if username not in self.conversation_history:
-                self.conversation_history[username] = []
+            now_iso = datetime.now().isoformat()
             
-            self.conversation_history[username].append({
-                "role": "user",
-                "content": message_text,
-                "timestamp": datetime.now().isoformat()
-            })
+            history = self.conversation_history.setdefault(username, deque(maxlen=HISTORY_MAXLEN))
             
-            await self.memory_client.add_memory(
+            history.append({"role": ROLE_USER, "content": message_text})
+            
+            self._queue_memory(MemoryWrite(
                 user_id=username,
                 message=message_text,
                 metadata={
                     "room": self.room_name,
-                    "timestamp": datetime.now().isoformat(),
-                    "type": "user_message"
+                    "timestamp": now_iso,
+                    "type": TYPE_USER_MESSAGE
                 }
-            )
+            ))
             
-            response = await self._generate_response(username, message_text)
+            message_id = uuid.uuid4().hex
+            response = await self._generate_response(username, message_text, message_id)
             
             if response:
-                self.conversation_history[username].append({
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": datetime.now().isoformat()
-                })
+                history.append({"role": ROLE_ASSISTANT, "content": response})
                 
-                await self.memory_client.add_memory(
+                self._queue_memory(MemoryWrite(
                     user_id=username,
                     message=f"AI Assistant: {response}",
                     metadata={
                         "room": self.room_name,
-                        "timestamp": datetime.now().isoformat(),
-                        "type": "ai_response"
+                        "timestamp": now_iso,
+                        "type": TYPE_AI_RESPONSE
                     }
-                )
+                ))
                 
-                await self._send_message(response)
+                await self._send_message(response, message_id)
             
         except Exception as e:
             logger.error(f"Error handling message: {str(e)}")
     
-    async def _generate_response(self, username: str, message: str) -> Optional[str]:
+    def _queue_memory(self, write: MemoryWrite):
+        try:
+            self.memory_queue.put_nowait(write)
+        except asyncio.QueueFull:
+            logger.warning(f"Memory write queue full, dropping memory for user {write.user_id}")
+    
+    async def _generate_response(self, username: str, message: str, message_id: str) -> Optional[str]:
         try:
             relevant_memories = await self.memory_client.search_memories(
                 user_id=username,
@@ -200,29 +235,40 @@ class ChatAgent:
             
             context = await self.llm_client.generate_context_summary(relevant_memories)
             
-            messages = []
-            
-            if username in self.conversation_history:
-                recent_history = self.conversation_history[username][-6:]
-                for msg in recent_history:
-                    messages.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
+            history = self.conversation_history.get(username, ())
+            messages = list(islice(history, max(len(history) - RECENT_HISTORY_TURNS, 0), None))
             
             if not messages or messages[-1]["content"] != message:
                 messages.append({
-                    "role": "user",
+                    "role": ROLE_USER,
                     "content": message
                 })
             
-            system_prompt = self.llm_client.get_system_prompt(self.agent_name)
-            
-            response = await self.llm_client.generate_response(
+            loop = asyncio.get_running_loop()
+            parts = []
+            pending = []
+            pending_chars = 0
+            last_flush = loop.time()
+            async for delta in self.llm_client.stream_response(
                 messages=messages,
-                system_prompt=system_prompt,
+                system_prompt=self._system_prompt,
                 context=context
-            )
+            ):
+                parts.append(delta)
+                pending.append(delta)
+                pending_chars += len(delta)
+                now = loop.time()
+                if pending_chars >= DELTA_FLUSH_CHARS or now - last_flush >= DELTA_FLUSH_INTERVAL:
+                    await self._send_delta(message_id, "".join(pending))
+                    pending.clear()
+                    pending_chars = 0
+                    last_flush = now
+            
+            if pending:
+                await self._send_delta(message_id, "".join(pending))
+            
+            response = "".join(parts)
+            logger.info(f"Streamed LLM response with {len(response)} characters")
             
             return response
             
@@ -230,25 +276,39 @@ class ChatAgent:
             logger.error(f"Error generating response: {str(e)}")
             return "I'm sorry, I encountered an error while processing your message. Could you please try again?"
     
-    async def _send_message(self, message: str):
+    async def _send_delta(self, message_id: str, delta: str):
+        if not self.room or not self.is_connected():
+            return
+        
+        payload = orjson.dumps({
+            "message_id": message_id,
+            "delta": delta,
+            "sender": self.agent_username,
+            "type": "chat_delta"
+        })
+        
+        # A lost delta must not abort the reply; the final "chat" packet carries the full text.
+        try:
+            await self.room.local_participant.publish_data(payload, reliable=True)
+        except Exception as e:
+            logger.warning(f"Error sending message delta: {str(e)}")
+    
+    async def _send_message(self, message: str, message_id: Optional[str] = None):
         try:
             if not self.room or not self.is_connected():
                 logger.warning("Cannot send message - agent not connected to room")
                 return
             
-            message_data = {
-                "message": message,
-                "sender": self.agent_username,
-                "timestamp": datetime.now().isoformat(),
-                "type": "chat"
-            }
-            
-            data_packet = rtc.DataPacket(
-                data=json.dumps(message_data).encode('utf-8'),
-                kind=rtc.DataPacketKind.KIND_RELIABLE
-            )
+            payload = b"".join((
+                b'{"message":',
+                orjson.dumps(message),
+                self._packet_sender,
+                orjson.dumps(datetime.now()),
+                b',"message_id":' + orjson.dumps(message_id) if message_id else b"",
+                b',"type":"chat"}'
+            ))
             
-            await self.room.local_participant.publish_data(data_packet)
+            await self.room.local_participant.publish_data(payload, reliable=True)
             logger.info(f"Sent message: {message}")
             
         except Exception as e:
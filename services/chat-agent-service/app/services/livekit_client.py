@@ -1,25 +1,50 @@
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from dataclasses import replace
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+import aiohttp
 from livekit.api import LiveKitAPI, AccessToken, VideoGrants
 from livekit import api 
-import json
+import orjson
 
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+ROOM_CACHE_TTL = 5.0
+TOKEN_TTL = timedelta(hours=24)
+
 class LiveKitClient:
     def __init__(self):
         self.api_key = settings.LIVEKIT_API_KEY
         self.api_secret = settings.LIVEKIT_API_SECRET
         self.livekit_url = settings.LIVEKIT_URL
         
-        self.lkapi = LiveKitAPI(self.livekit_url, api_key=self.api_key, api_secret=self.api_secret)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=75)
+        )
+        self.lkapi = LiveKitAPI(
+            self.livekit_url,
+            api_key=self.api_key,
+            api_secret=self.api_secret,
+            session=self._session
+        )
         self.room_service = self.lkapi.room
         
+        self._room_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._grants_template = VideoGrants(
+            room_join=True,
+            can_publish=True,
+            can_subscribe=True
+        )
+    
+    async def close(self):
+        await self.lkapi.aclose()
+        await self._session.close()
+        
     async def create_room(
         self, 
         room_name: str, 
@@ -32,18 +57,26 @@ class LiveKitClient:
                 name=room_name,
                 empty_timeout=empty_timeout,
                 max_participants=max_participants,
-                metadata=json.dumps(metadata) if metadata else None
+                metadata=orjson.dumps(metadata).decode() if metadata else None
             )
             
             room = await self.room_service.create_room(room_create_options)
             
+            self._room_cache[room.name] = (time.monotonic(), {
+                "name": room.name,
+                "sid": room.sid,
+                "num_participants": room.num_participants,
+                "creation_time": room.creation_time,
+                "metadata": orjson.loads(room.metadata) if room.metadata else None
+            })
+            
             logger.info(f"Created room: {room_name}")
             return {
                 "name": room.name,
                 "sid": room.sid,
                 "max_participants": room.max_participants,
                 "creation_time": room.creation_time,
-                "metadata": json.loads(room.metadata) if room.metadata else None
+                "metadata": orjson.loads(room.metadata) if room.metadata else None
             }
             
         except Exception as e:
@@ -61,7 +94,7 @@ class LiveKitClient:
                     "sid": room.sid,
                     "num_participants": room.num_participants,
                     "creation_time": room.creation_time,
-                    "metadata": json.loads(room.metadata) if room.metadata else None
+                    "metadata": orjson.loads(room.metadata) if room.metadata else None
                 }
                 room_list.append(room_info)
             
@@ -86,14 +119,26 @@ class LiveKitClient:
                 "sid": room.sid,
                 "num_participants": room.num_participants,
                 "creation_time": room.creation_time,
-                "metadata": json.loads(room.metadata) if room.metadata else None
+                "metadata": orjson.loads(room.metadata) if room.metadata else None
             }
             
         except Exception as e:
             logger.error(f"Error getting room {room_name}: {str(e)}")
             raise
     
+    async def get_room_cached(self, room_name: str) -> Dict[str, Any]:
+        cached = self._room_cache.get(room_name)
+        if cached is not None:
+            if time.monotonic() - cached[0] < ROOM_CACHE_TTL:
+                return cached[1]
+            self._room_cache.pop(room_name, None)
+        
+        room_info = await self.get_room(room_name)
+        self._room_cache[room_name] = (time.monotonic(), room_info)
+        return room_info
+    
     async def delete_room(self, room_name: str):
+        self._room_cache.pop(room_name, None)
         try:
             await self.room_service.delete_room(
                 api.DeleteRoomRequest(room=room_name)
@@ -112,18 +157,13 @@ class LiveKitClient:
     ) -> str:
         try:
             token = AccessToken(self.api_key, self.api_secret)
-            token = token.with_grants(VideoGrants(
-                room_join=True,
-                room=room_name,
-                can_publish=True,
-                can_subscribe=True
-            ))
+            token = token.with_grants(replace(self._grants_template, room=room_name))
             token.identity = username
             
             if metadata:
-                token.metadata = json.dumps(metadata)
+                token.metadata = orjson.dumps(metadata).decode()
             
-            token.ttl = timedelta(hours=24)
+            token.ttl = TOKEN_TTL
             
             jwt_token = token.to_jwt()
             logger.info(f"Generated token for user {username} in room {room_name}")
@@ -134,6 +174,11 @@ class LiveKitClient:
             logger.error(f"Error generating token for {username}: {str(e)}")
             raise
     
+    def warm_up_token_signing(self):
+        token = AccessToken(self.api_key, self.api_secret)
+        token.identity = "warm_up"
+        token.to_jwt()
+    
     async def validate_token(self, token: str) -> bool:
         try:
             access_token = AccessToken.from_jwt(token, self.api_secret)
@@ -157,7 +202,7 @@ class LiveKitClient:
                     "name": participant.name,
                     "state": participant.state,
                     "joined_at": participant.joined_at,
-                    "metadata": json.loads(participant.metadata) if participant.metadata else None
+                    "metadata": orjson.loads(participant.metadata) if participant.metadata else None
                 }
                 participant_list.append(participant_info)
             
@@ -1,16 +1,111 @@
+import httpx
 import logging
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Any, Optional
 from app.config.settings import settings
-from groq import AsyncGroq
+from app.services.response_cache import ResponseCache
+from groq import AsyncGroq, DEFAULT_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+# Sampling above this temperature is meant to vary, so those completions are never reused.
+CACHEABLE_MAX_TEMPERATURE = 0.3
+
+SUMMARY_MAX_MEMORIES = 10
+
+SYSTEM_PROMPT_TEMPLATE = """You are {agent_name}, a helpful AI assistant participating in a real-time chat room. 
+
+Key instructions:
+- You have access to context from previous conversations with users
+- Be conversational, friendly, and engaging
+- Remember and reference previous interactions when relevant
+- Keep responses concise but informative (1-3 sentences typically)
+- Ask follow-up questions to maintain engagement
+- If you don't have context about a user, treat them warmly as a new friend
+- Adapt your personality to match the conversation tone
+- Be helpful with questions and provide value in every interaction
+
+Remember: This is a real-time chat environment, so keep responses natural and conversational."""
+
+# Kept byte-identical across calls so the provider can reuse the cached prompt prefix.
+@lru_cache(maxsize=32)
+def build_system_prompt(agent_name: str) -> str:
+    return SYSTEM_PROMPT_TEMPLATE.format(agent_name=agent_name)
+
 class LLMClient:
-    def __init__(self):
-        self.client = AsyncGroq(api_key=settings.GROQ_API_KEY)
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self.client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            timeout=DEFAULT_TIMEOUT,
+            http_client=http_client
+        )
         self.model = settings.LLM_MODEL
         self.temperature = settings.TEMPERATURE
         self.max_context_length = settings.MAX_CONTEXT_LENGTH
+        self.agent_name = settings.AGENT_NAME
+        self.response_cache = ResponseCache()
+    
+    async def _complete(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        cache_key = None
+        if temperature <= CACHEABLE_MAX_TEMPERATURE:
+            cache_key = ResponseCache.make_key(self.model, temperature, max_tokens, messages)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("LLM response cache hit")
+                return cached
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        content = response.choices[0].message.content
+        
+        if cache_key is not None and content:
+            self.response_cache.set(cache_key, content)
+        
+        return content
+    
+    def _build_conversation(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str],
+        context: Optional[str]
+    ) -> List[Dict[str, str]]:
+        conversation = []
+        
+        if system_prompt:
+            conversation.append({"role": "system", "content": system_prompt})
+        
+        if context:
+            conversation.append({
+                "role": "system", 
+                "content": f"Relevant context from previous conversations:\n{context}"
+            })
+        
+        conversation.extend(messages)
+        return conversation
+    
+    async def stream_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        system_prompt: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        conversation = self._build_conversation(messages, system_prompt, context)
+        
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=conversation,
+            temperature=self.temperature,
+            max_tokens=1000,
+            stream=True
+        )
+        
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
     
     async def generate_response(
         self, 
@@ -19,27 +114,9 @@ class LLMClient:
         context: Optional[str] = None
     ) -> str:
         try:
-            conversation = []
+            conversation = self._build_conversation(messages, system_prompt, context)
             
-            if system_prompt:
-                conversation.append({"role": "system", "content": system_prompt})
-            
-            if context:
-                conversation.append({
-                    "role": "system", 
-                    "content": f"Relevant context from previous conversations:\n{context}"
-                })
-            
-            conversation.extend(messages)
-            
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=conversation,
-                temperature=self.temperature,
-                max_tokens=1000
-            )
-            
-            content = response.choices[0].message.content
+            content = await self._complete(conversation, self.temperature, 1000)
             logger.info(f"Generated LLM response with {len(content)} characters")
             
             return content
@@ -65,7 +142,7 @@ class LLMClient:
             if not memory_texts:
                 return ""
             
-            memories_content = "\n".join(memory_texts[:10])  
+            memories_content = "\n".join(memory_texts[:SUMMARY_MAX_MEMORIES])
             
             summarization_prompt = f"""
             Please create a concise summary of the following previous conversation context that would be helpful for continuing a conversation:
@@ -76,14 +153,11 @@ class LLMClient:
             Summary:
             """
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": summarization_prompt}],
-                temperature=0.3,
-                max_tokens=300
+            summary = await self._complete(
+                [{"role": "user", "content": summarization_prompt}],
+                0.3,
+                300
             )
-            
-            summary = response.choices[0].message.content
             logger.info(f"Generated context summary with {len(summary)} characters")
             
             return summary
@@ -93,18 +167,4 @@ class LLMClient:
             return ""
     
     def get_system_prompt(self, agent_name: str = None) -> str:
-        agent_name = agent_name or settings.AGENT_NAME
-        
-        return f"""You are {agent_name}, a helpful AI assistant participating in a real-time chat room. 
-
-Key instructions:
-- You have access to context from previous conversations with users
-- Be conversational, friendly, and engaging
-- Remember and reference previous interactions when relevant
-- Keep responses concise but informative (1-3 sentences typically)
-- Ask follow-up questions to maintain engagement
-- If you don't have context about a user, treat them warmly as a new friend
-- Adapt your personality to match the conversation tone
-- Be helpful with questions and provide value in every interaction
-
-Remember: This is a real-time chat environment, so keep responses natural and conversational."""
\ No newline at end of file
+        return build_system_prompt(agent_name or self.agent_name)
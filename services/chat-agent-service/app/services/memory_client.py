@@ -1,17 +1,29 @@
+import asyncio
 import httpx
 import logging
-from typing import Dict, Any, List, Optional
+import orjson
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+JSON_HEADERS = {"content-type": "application/json"}
+
+class MemoryWrite(NamedTuple):
+    user_id: str
+    message: str
+    metadata: Optional[Dict[str, Any]] = None
+
 class MemoryClient:
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.base_url = settings.MEMORY_SERVICE_URL
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self._owns_client = http_client is None
+        self.client = http_client or httpx.AsyncClient(timeout=30.0)
+        self._inflight: Dict[Tuple[str, str, int], asyncio.Task] = {}
     
     async def close(self):
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
     
     async def add_memory(
         self, 
@@ -28,11 +40,12 @@ class MemoryClient:
             
             response = await self.client.post(
                 f"{self.base_url}/api/v1/memory/add",
-                json=payload
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             logger.info(f"Added memory for user {user_id}")
             return result
             
@@ -40,6 +53,13 @@ class MemoryClient:
             logger.error(f"Error adding memory for user {user_id}: {str(e)}")
             raise
     
+    async def add_memory_bulk(self, writes: List[MemoryWrite]) -> int:
+        results = await asyncio.gather(
+            *(self.add_memory(w.user_id, w.message, w.metadata) for w in writes),
+            return_exceptions=True
+        )
+        return sum(1 for result in results if not isinstance(result, BaseException))
+    
     async def get_memories(
         self, 
         user_id: str, 
@@ -61,7 +81,7 @@ class MemoryClient:
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             memories = result.get("memories", [])
             
             logger.info(f"Retrieved {len(memories)} memories for user {user_id}")
@@ -76,6 +96,21 @@ class MemoryClient:
         user_id: str, 
         query: str, 
         limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        # Concurrent identical searches share one request to the memory service.
+        key = (user_id, query, limit)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._search_memories(user_id, query, limit))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _search_memories(
+        self, 
+        user_id: str, 
+        query: str, 
+        limit: int
     ) -> List[Dict[str, Any]]:
         try:
             payload = {
@@ -86,11 +121,12 @@ class MemoryClient:
             
             response = await self.client.post(
                 f"{self.base_url}/api/v1/memory/search",
-                json=payload
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             memories = result.get("memories", [])
             
             logger.info(f"Found {len(memories)} relevant memories for user {user_id}")
@@ -100,6 +136,32 @@ class MemoryClient:
             logger.error(f"Error searching memories for user {user_id}: {str(e)}")
             raise
     
+    async def batch_search(self, queries: List[Tuple[str, str, int]]) -> List[List[Dict[str, Any]]]:
+        try:
+            payload = {
+                "queries": [
+                    {"username": user_id, "query": query, "limit": limit}
+                    for user_id, query, limit in queries
+                ]
+            }
+            
+            response = await self.client.post(
+                f"{self.base_url}/api/v1/memories/batch-search",
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS
+            )
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            results = [item.get("memories", []) for item in result.get("results", [])]
+            
+            logger.info(f"Ran batch memory search for {len(queries)} queries")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error running batch memory search: {str(e)}")
+            raise
+    
     async def get_all_memories(self, user_id: str) -> List[Dict[str, Any]]:
         try:
             response = await self.client.get(
@@ -108,7 +170,7 @@ class MemoryClient:
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             memories = result.get("memories", [])
             
             logger.info(f"Retrieved all {len(memories)} memories for user {user_id}")
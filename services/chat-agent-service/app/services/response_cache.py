@@ -0,0 +1,49 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# System prompts and summaries repeat across turns, so their normalised form is memoised.
+@lru_cache(maxsize=1024)
+def normalize_text(text: str) -> str:
+    # Only case and spacing are folded; punctuation changes meaning ("3.5" vs "35").
+    return WHITESPACE_RE.sub(" ", text.casefold()).strip()
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 1800.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(model: str, temperature: float, max_tokens: int, messages: List[Dict[str, Any]]) -> str:
+        digest = hashlib.blake2b(f"{model}\x1f{temperature}\x1f{max_tokens}".encode(), digest_size=16)
+        for m in messages:
+            digest.update(b"\x1e")
+            digest.update(m["role"].encode())
+            digest.update(b"\x1f")
+            digest.update(normalize_text(m["content"]).encode())
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: str):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
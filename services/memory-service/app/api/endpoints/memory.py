@@ -1,11 +1,17 @@
 import logging
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, Request
+import time
+from functools import lru_cache
+from typing import Annotated
+from fastapi import APIRouter, Depends, Request, Response
+from pydantic import BaseModel
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from app.models.requests import MemoryStoreRequest, MemoryRetrieveRequest
-from app.models.responses import MemoryResponse, MemorySearchResponse, HealthResponse
+from app.models.requests import MemoryStoreRequest, MemoryRetrieveRequest, MemoryBatchSearchRequest
+from app.models.responses import (
+    MemoryResponse, MemorySearchResponse, MemoryBatchSearchResponse, HealthResponse,
+    MEMORY_RESPONSE_EXAMPLE, MEMORY_SEARCH_RESPONSE_EXAMPLE, HEALTH_RESPONSE_EXAMPLE
+)
 from app.services.memory_service import MemoryService
 from app.services.mem0_client import get_mem0_client, health_check_mem0
 from app.config.settings import get_settings
@@ -13,235 +19,120 @@ from app.config.settings import get_settings
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["Memory"])
 
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=get_settings().REDIS_URL or "memory://",
+    strategy="moving-window",
+    in_memory_fallback_enabled=True
+)
+
+@lru_cache(maxsize=1)
+def _memory_service() -> MemoryService:
+    return MemoryService(get_mem0_client(get_settings()))
+
 
 def get_memory_service() -> MemoryService:
-    settings = get_settings()
-    mem0_client = get_mem0_client(settings)
-    return MemoryService(mem0_client)
+    return _memory_service()
+
+
+MemoryServiceDep = Annotated[MemoryService, Depends(get_memory_service, use_cache=True)]
+
+
+def _json_response(model: BaseModel) -> Response:
+    # Read paths return trusted, service-built models; serialize them in pydantic-core
+    # instead of re-validating them against the response_model.
+    return Response(model.model_dump_json(), media_type="application/json")
+
+
+def _example(example: dict) -> dict:
+    return {200: {"content": {"application/json": {"example": example}}}}
 
 
 @router.post("/memories",
              response_model=MemoryResponse,
+             responses=_example(MEMORY_RESPONSE_EXAMPLE),
              summary="Store a memory",
              description="Store a new memory for a user")
 @limiter.limit("30/minute")
 async def store_memory(
     request: Request,
     memory_request: MemoryStoreRequest,
-    memory_service: MemoryService = Depends(get_memory_service)
+    memory_service: MemoryServiceDep
 ) -> MemoryResponse:
-    try:
-        logger.info(f"Received store memory request: {memory_request}")
-        result = await memory_service.store_memory(memory_request)
-        logger.info(f"Successfully stored memory: {result}")
-        return result
-    except ValueError as ve:
-        logger.error(f"Validation error: {str(ve)}", exc_info=True)
-        return JSONResponse(
-            status_code=400,
-            content={
-                "success": False,
-                "message": str(ve),
-                "error_code": "MEMORY_STORE_VALIDATION_ERROR",
-                "details": str(ve)
-            }
-        )
-    except HTTPException as he:
-        return JSONResponse(
-            status_code=he.status_code,
-            content={
-                "success": False,
-                "message": he.detail if isinstance(he.detail, str) else he.detail.get("message", "HTTP error"),
-                "error_code": he.detail.get("error_code", "HTTP_ERROR") if isinstance(he.detail, dict) else "HTTP_ERROR",
-                "details": he.detail
-            }
-        )
-    except Exception as e:
-        logger.error(f"Failed to store memory: {str(e)}", exc_info=True)
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to store memory",
-                "error_code": "MEMORY_STORE_FAILED",
-                "details": str(e)
-            }
-        )
+    logger.info(f"Received store memory request: {memory_request}")
+    result = await memory_service.store_memory(memory_request)
+    logger.info(f"Successfully stored memory: {result}")
+    return result
 
 
 @router.post("/memories/search",
              response_model=MemorySearchResponse,
+             responses=_example(MEMORY_SEARCH_RESPONSE_EXAMPLE),
              summary="Search memories",
              description="Search and retrieve memories for a user based on a query")
 @limiter.limit("30/minute")
 async def search_memories(
     request: Request,
     search_request: MemoryRetrieveRequest,
-    memory_service: MemoryService = Depends(get_memory_service)
-) -> MemorySearchResponse:
-    try:
-        result = await memory_service.retrieve_memories(search_request)
-        return result
-    except ValueError as ve:
-        return JSONResponse(
-            status_code=400,
-            content={
-                "success": False,
-                "message": str(ve),
-                "error_code": "MEMORY_SEARCH_VALIDATION_ERROR",
-                "details": str(ve)
-            }
-        )
-    except HTTPException as he:
-        return JSONResponse(
-            status_code=he.status_code,
-            content={
-                "success": False,
-                "message": he.detail if isinstance(he.detail, str) else he.detail.get("message", "HTTP error"),
-                "error_code": he.detail.get("error_code", "HTTP_ERROR") if isinstance(he.detail, dict) else "HTTP_ERROR",
-                "details": he.detail
-            }
-        )
-    except Exception as e:
-        logger.error(f"Failed to search memories for user {search_request.username}: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to search memories",
-                "error_code": "MEMORY_SEARCH_FAILED",
-                "details": str(e)
-            }
-        )
+    memory_service: MemoryServiceDep
+) -> Response:
+    return _json_response(await memory_service.retrieve_memories(search_request))
+
+
+@router.post("/memories/batch-search",
+             response_model=MemoryBatchSearchResponse,
+             summary="Batch search memories",
+             description="Run several memory searches in one request; results are aligned with the queries")
+@limiter.limit("30/minute")
+async def batch_search_memories(
+    request: Request,
+    batch_request: MemoryBatchSearchRequest,
+    memory_service: MemoryServiceDep
+) -> Response:
+    return _json_response(await memory_service.batch_retrieve(batch_request))
 
 
 @router.get("/memories/{username}",
             response_model=MemorySearchResponse,
+            responses=_example(MEMORY_SEARCH_RESPONSE_EXAMPLE),
             summary="Get all user memories",
             description="Retrieve all memories for a specific user")
 @limiter.limit("30/minute")
 async def get_user_memories(
     request: Request,
     username: str,
-    limit: int = 10,
-    memory_service: MemoryService = Depends(get_memory_service)
-) -> MemorySearchResponse:
-    try:
-        if not username.strip():
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "message": "Username cannot be empty",
-                    "error_code": "USERNAME_REQUIRED",
-                    "username": username
-                }
-            )
-        if limit < 1 or limit > 50:
-            return JSONResponse(
-                status_code=422,
-                content={
-                    "success": False,
-                    "message": "Limit must be between 1 and 50",
-                    "error_code": "LIMIT_OUT_OF_RANGE",
-                    "limit": limit
-                }
-            )
-        result = await memory_service.get_user_memories(username.strip(), limit)
-        return result
-    except HTTPException as he:
-        return JSONResponse(
-            status_code=he.status_code,
-            content={
-                "success": False,
-                "message": he.detail if isinstance(he.detail, str) else he.detail.get("message", "HTTP error"),
-                "error_code": he.detail.get("error_code", "HTTP_ERROR") if isinstance(he.detail, dict) else "HTTP_ERROR",
-                "details": he.detail
-            }
-        )
-    except Exception as e:
-        logger.error(f"Failed to get memories for user {username}: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to get user memories",
-                "error_code": "MEMORY_GET_FAILED",
-                "details": str(e)
-            }
-        )
+    memory_service: MemoryServiceDep,
+    limit: int = 10
+) -> Response:
+    return _json_response(await memory_service.get_user_memories(username, limit))
 
 
 @router.delete("/memories/{username}",
                response_model=MemoryResponse,
+               responses=_example(MEMORY_RESPONSE_EXAMPLE),
                summary="Delete all user memories",
                description="Delete all memories for a specific user")
 @limiter.limit("10/minute")
 async def delete_user_memories(
     request: Request,
     username: str,
-    memory_service: MemoryService = Depends(get_memory_service)
+    memory_service: MemoryServiceDep
 ) -> MemoryResponse:
-    try:
-        if not username.strip():
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "success": False,
-                    "message": "Username cannot be empty",
-                    "error_code": "USERNAME_REQUIRED",
-                    "username": username
-                }
-            )
-        result = await memory_service.delete_user_memories(username.strip())
-        return result
-    except HTTPException as he:
-        return JSONResponse(
-            status_code=he.status_code,
-            content={
-                "success": False,
-                "message": he.detail if isinstance(he.detail, str) else he.detail.get("message", "HTTP error"),
-                "error_code": he.detail.get("error_code", "HTTP_ERROR") if isinstance(he.detail, dict) else "HTTP_ERROR",
-                "details": he.detail
-            }
-        )
-    except Exception as e:
-        logger.error(f"Failed to delete memories for user {username}: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Failed to delete user memories",
-                "error_code": "MEMORY_DELETE_FAILED",
-                "details": str(e)
-            }
-        )
+    return await memory_service.delete_user_memories(username)
 
 
 @router.get("/health",
             response_model=HealthResponse,
+            responses=_example(HEALTH_RESPONSE_EXAMPLE),
             summary="Health check",
             description="Check the health status of the memory service")
 async def health_check() -> HealthResponse:
-    try:
-        settings = get_settings()
-        mem0_status = "connected" if await health_check_mem0(settings) else "disconnected"
-        status = "healthy" if mem0_status == "connected" else "unhealthy"
-        return HealthResponse(
-            status=status,
-            service=settings.SERVICE_NAME,
-            mem0=mem0_status,
-            timestamp=datetime.utcnow().isoformat() + "Z"
-        )
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "message": "Health check failed",
-                "error_code": "HEALTH_CHECK_FAILED",
-                "details": str(e)
-            }
-        )
+    settings = get_settings()
+    mem0_status = "connected" if await health_check_mem0(settings) else "disconnected"
+    status = "healthy" if mem0_status == "connected" else "unhealthy"
+    return HealthResponse(
+        status=status,
+        service=settings.SERVICE_NAME,
+        mem0=mem0_status,
+        timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    )
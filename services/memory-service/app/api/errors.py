@@ -0,0 +1,52 @@
+from typing import Any, Dict, Optional
+from fastapi import HTTPException
+
+
+class MemoryServiceError(HTTPException):
+    status_code = 500
+    error_code = "MEMORY_ERROR"
+    message = "Memory operation failed"
+
+    def __init__(self, details: Any = None, *, message: Optional[str] = None, **extra: Any):
+        super().__init__(status_code=type(self).status_code, detail=message or self.message)
+        self.details = details
+        self.extra = extra
+
+    def to_content(self) -> Dict[str, Any]:
+        content = {"success": False, "message": self.detail, "error_code": self.error_code}
+        if self.details is not None:
+            content["details"] = self.details
+        content.update(self.extra)
+        return content
+
+
+class UsernameRequiredError(MemoryServiceError):
+    status_code = 400
+    error_code = "USERNAME_REQUIRED"
+    message = "Username cannot be empty"
+
+
+class LimitOutOfRangeError(MemoryServiceError):
+    status_code = 422
+    error_code = "LIMIT_OUT_OF_RANGE"
+    message = "Limit must be between 1 and 50"
+
+
+class MemoryStoreError(MemoryServiceError):
+    error_code = "MEMORY_STORE_FAILED"
+    message = "Failed to store memory"
+
+
+class MemorySearchError(MemoryServiceError):
+    error_code = "MEMORY_SEARCH_FAILED"
+    message = "Failed to search memories"
+
+
+class MemoryGetError(MemoryServiceError):
+    error_code = "MEMORY_GET_FAILED"
+    message = "Failed to get user memories"
+
+
+class MemoryDeleteError(MemoryServiceError):
+    error_code = "MEMORY_DELETE_FAILED"
+    message = "Failed to delete user memories"
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from pydantic import Field, field_validator
 from typing import Optional, List
@@ -20,6 +21,8 @@ class Settings(BaseSettings):
     
     RATE_LIMIT: str = "100/minute"
     
+    REDIS_URL: Optional[str] = Field(None, description="Shared rate-limit storage, e.g. redis://redis:6379/0")
+    
     @field_validator("LOG_LEVEL")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
@@ -43,11 +46,6 @@ class Settings(BaseSettings):
     }
 
 
-_settings: Optional[Settings] = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
\ No newline at end of file
+    return Settings()
\ No newline at end of file
@@ -1,15 +1,18 @@
+import asyncio
 import logging
+import os
+import random
 import uvicorn
-import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from fastapi.responses import ORJSONResponse
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
+from app.api.endpoints.memory import limiter
+from app.api.errors import MemoryServiceError
 from app.api.router import api_router
 from app.config.settings import get_settings
 from app.services.mem0_client import close_mem0_client, get_mem0_client
@@ -26,7 +29,8 @@ def setup_logging():
 
 
 logger = setup_logging()
-limiter = Limiter(key_func=get_remote_address)
+
+REQUEST_LOG_SAMPLE_RATE = 0.05
 
 
 @asynccontextmanager
@@ -52,7 +56,7 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         logger.info("Shutting down memory service...")
-        close_mem0_client()
+        await close_mem0_client(get_settings())
         logger.info("Memory service shutdown complete")
 
 def create_app() -> FastAPI:
@@ -65,18 +69,21 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
 
+    allow_any_origin = "*" in settings.CORS_ORIGINS
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.CORS_ORIGINS,
-        allow_credentials=True,
-        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_credentials=not allow_any_origin,
+        allow_methods=("GET", "POST", "PUT", "DELETE"),
         allow_headers=["*"],
     )
 
-    app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
+    if "*" not in settings.ALLOWED_HOSTS:
+        app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
 
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -95,7 +102,7 @@ def create_app() -> FastAPI:
             loc = ' -> '.join(str(l) for l in err.get('loc', []))
             msg = err.get('msg', 'Invalid input')
             errors.append({"location": loc, "message": msg})
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=422,
             content={
                 "success": False,
@@ -112,7 +119,7 @@ def create_app() -> FastAPI:
 
         error_detail = str(exc) if settings.DEBUG else "An internal error occurred"
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -121,13 +128,19 @@ def create_app() -> FastAPI:
             },
         )
 
+    @app.exception_handler(MemoryServiceError)
+    async def memory_exception_handler(request: Request, exc: MemoryServiceError):
+        if exc.status_code >= 500:
+            logger.error(f"{exc.error_code} on {request.method} {request.url}: {exc.details}")
+        return ORJSONResponse(status_code=exc.status_code, content=exc.to_content())
+
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
         logger.warning(
             f"HTTP exception on {request.method} {request.url}: "
             f"{exc.status_code} - {exc.detail}"
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={
                 "success": False,
@@ -147,6 +160,7 @@ def create_app() -> FastAPI:
             "endpoints": {
                 "store_memory": "POST /api/v1/memories",
                 "search_memories": "POST /api/v1/memories/search",
+                "batch_search_memories": "POST /api/v1/memories/batch-search",
                 "get_user_memories": "GET /api/v1/memories/{username}",
                 "delete_user_memories": "DELETE /api/v1/memories/{username}",
             },
@@ -159,11 +173,14 @@ def create_app() -> FastAPI:
 
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
-        start_time = time.time()
-        logger.info(f"Request: {request.method} {request.url}")
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         response = await call_next(request)
-        process_time = time.time() - start_time
-        logger.info(f"Response: {response.status_code} - {process_time:.4f}s")
+        if response.status_code >= 400 or random.random() < REQUEST_LOG_SAMPLE_RATE:
+            logger.info(
+                "%s %s %d %.4fs",
+                request.method, request.url.path, response.status_code, loop.time() - start_time
+            )
         return response
 
     return app
@@ -180,10 +197,16 @@ if __name__ == "__main__":
     logger.info(f"Debug mode: {settings.DEBUG}")
     logger.info(f"Log level: {settings.LOG_LEVEL}")
 
+    # Per-worker memory:// limits would multiply with the worker count; only scale out on Redis.
+    workers = max(1, os.cpu_count() or 1) if settings.REDIS_URL and not settings.DEBUG else 1
+
     uvicorn.run(
         "app.main:app", 
         host=settings.HOST,
         port=settings.PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
         reload=settings.DEBUG,
         log_level=settings.LOG_LEVEL.lower(),
     )
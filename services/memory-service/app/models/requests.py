@@ -1,26 +1,16 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Dict, Any, Optional
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, Dict, Any, List, Optional
+
+MAX_BATCH_SEARCH_ITEMS = 48
+
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
 
 
 class MemoryStoreRequest(BaseModel):
-    username: str = Field(..., min_length=1, description="Username to associate memory with")
-    message: str = Field(..., min_length=1, description="User message to store")
+    username: NonEmptyStr = Field(..., description="Username to associate memory with")
+    message: NonEmptyStr = Field(..., description="User message to store")
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Additional metadata")
     
-    @field_validator("username")
-    @classmethod
-    def validate_username(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Username cannot be empty or whitespace only")
-        return v.strip()
-    
-    @field_validator("message")
-    @classmethod
-    def validate_message(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Message cannot be empty or whitespace only")
-        return v.strip()
-    
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -33,24 +23,10 @@ class MemoryStoreRequest(BaseModel):
 
 
 class MemoryRetrieveRequest(BaseModel):
-    username: str = Field(..., min_length=1, description="Username to retrieve memories for")
-    query: str = Field(..., min_length=1, description="Query to search memories")
+    username: NonEmptyStr = Field(..., description="Username to retrieve memories for")
+    query: NonEmptyStr = Field(..., description="Query to search memories")
     limit: Optional[int] = Field(default=5, ge=1, le=20, description="Maximum number of memories to retrieve")
     
-    @field_validator("username")
-    @classmethod
-    def validate_username(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Username cannot be empty or whitespace only")
-        return v.strip()
-    
-    @field_validator("query")
-    @classmethod
-    def validate_query(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Query cannot be empty or whitespace only")
-        return v.strip()
-    
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -59,4 +35,24 @@ class MemoryRetrieveRequest(BaseModel):
                 "limit": 5
             }
         }
-    }
\ No newline at end of file
+    }
+
+
+class MemoryBatchSearchRequest(BaseModel):
+    queries: List[MemoryRetrieveRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SEARCH_ITEMS,
+        description="Searches to run; results are returned in the same order"
+    )
+    
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "queries": [
+                    {"username": "john_doe", "query": "What are my hobbies?", "limit": 5},
+                    {"username": "jane_doe", "query": "Where do I work?", "limit": 3}
+                ]
+            }
+        }
+    }
@@ -1,25 +1,42 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 
+MEMORY_RESPONSE_EXAMPLE = {
+    "success": True,
+    "message": "Memory stored successfully",
+    "data": {
+        "memory_id": "mem_123",
+        "username": "john_doe",
+        "stored_at": "2024-01-15T10:30:00.000Z"
+    }
+}
+
+MEMORY_SEARCH_RESPONSE_EXAMPLE = {
+    "success": True,
+    "message": "Memories retrieved successfully",
+    "memories": [
+        {
+            "id": "mem_123",
+            "text": "User loves playing chess on weekends",
+            "score": 0.95,
+            "metadata": {"timestamp": "2024-01-15T10:30:00"}
+        }
+    ],
+    "count": 1
+}
+
+HEALTH_RESPONSE_EXAMPLE = {
+    "status": "healthy",
+    "service": "memory-service",
+    "mem0": "connected",
+    "timestamp": "2024-01-15T10:30:00Z"
+}
+
 
 class MemoryResponse(BaseModel):
     success: bool = Field(..., description="Whether operation was successful")
     message: str = Field(..., description="Response message")
     data: Optional[Dict[str, Any]] = Field(default=None, description="Response data")
-    
-    model_config = {
-        "json_schema_extra": {
-            "example": {
-                "success": True,
-                "message": "Memory stored successfully",
-                "data": {
-                    "memory_id": "mem_123",
-                    "username": "john_doe",
-                    "stored_at": "2024-01-15T10:30:00.000Z"
-                }
-            }
-        }
-    }
 
 
 class Memory(BaseModel):
@@ -27,20 +44,6 @@ class Memory(BaseModel):
     text: str = Field(..., description="Memory content")
     score: Optional[float] = Field(default=None, description="Similarity score (for search results)")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Memory metadata")
-    
-    model_config = {
-        "json_schema_extra": {
-            "example": {
-                "id": "mem_123",
-                "text": "User loves playing chess on weekends",
-                "score": 0.95,
-                "metadata": {
-                    "timestamp": "2024-01-15T10:30:00",
-                    "username": "john_doe"
-                }
-            }
-        }
-    }
 
 
 class MemorySearchResponse(BaseModel):
@@ -48,24 +51,13 @@ class MemorySearchResponse(BaseModel):
     message: str = Field(..., description="Response message")
     memories: List[Memory] = Field(default_factory=list, description="Retrieved memories")
     count: int = Field(..., description="Number of memories found")
-    
-    model_config = {
-        "json_schema_extra": {
-            "example": {
-                "success": True,
-                "message": "Memories retrieved successfully",
-                "memories": [
-                    {
-                        "id": "mem_123",
-                        "text": "User loves playing chess on weekends",
-                        "score": 0.95,
-                        "metadata": {"timestamp": "2024-01-15T10:30:00"}
-                    }
-                ],
-                "count": 1
-            }
-        }
-    }
+
+
+class MemoryBatchSearchResponse(BaseModel):
+    success: bool = Field(..., description="Whether every search in the batch succeeded")
+    message: str = Field(..., description="Response message")
+    results: List[MemorySearchResponse] = Field(default_factory=list, description="Per-query results, aligned with the request")
+    count: int = Field(..., description="Number of queries processed")
 
 
 class HealthResponse(BaseModel):
@@ -73,14 +65,3 @@ class HealthResponse(BaseModel):
     service: str = Field(..., description="Service name")
     mem0: str = Field(..., description="mem0 connection status")
     timestamp: str = Field(..., description="Health check timestamp")
-    
-    model_config = {
-        "json_schema_extra": {
-            "example": {
-                "status": "healthy",
-                "service": "memory-service",
-                "mem0": "connected",
-                "timestamp": "2024-01-15T10:30:00Z"
-            }
-        }
-    }
\ No newline at end of file
@@ -1,19 +1,80 @@
+import asyncio
 import logging
-from typing import Optional
-from mem0 import MemoryClient
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+import orjson
+
 from app.config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
-_mem0_client: Optional[MemoryClient] = None
+MEM0_API_HOST = "https://api.mem0.ai/v1"
+JSON_HEADERS = {"content-type": "application/json"}
+
+
+class AsyncMem0Client:
+    
+    def __init__(self, api_key: str, host: str = MEM0_API_HOST):
+        self._client = httpx.AsyncClient(
+            base_url=host,
+            headers={"Authorization": f"Token {api_key}"},
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=64, keepalive_expiry=60)
+        )
+    
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        response = await self._client.request(method, path, **kwargs)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    @staticmethod
+    def _without_none(values: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in values.items() if v is not None}
+    
+    async def add(self, messages: Union[str, List[Dict[str, str]]], **kwargs: Any) -> Any:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        payload = {"messages": messages, **self._without_none(kwargs)}
+        return await self._request("POST", "/memories/", content=orjson.dumps(payload), headers=JSON_HEADERS)
+    
+    async def search(self, query: str, **kwargs: Any) -> Any:
+        payload = {"query": query, **self._without_none(kwargs)}
+        return await self._request("POST", "/memories/search/", content=orjson.dumps(payload), headers=JSON_HEADERS)
+    
+    async def get_all(self, **kwargs: Any) -> Any:
+        return await self._request("GET", "/memories/", params=self._without_none(kwargs))
+    
+    async def delete_all(self, **kwargs: Any) -> Any:
+        return await self._request("DELETE", "/memories/", params=self._without_none(kwargs))
+    
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def extract_memory_id(result: Any) -> str:
+    # mem0's add returns either a single memory dict or a list of memory events.
+    if isinstance(result, list):
+        result = result[0] if result else None
+    if isinstance(result, dict):
+        return result.get("id", "unknown")
+    return "unknown"
 
 
-def create_mem0_client(settings: Settings) -> MemoryClient:
+HEALTH_CHECK_TTL = 5.0
+_health_status: Optional[Tuple[float, bool]] = None
+_health_lock = asyncio.Lock()
+
+
+def create_mem0_client(api_key: Optional[str]) -> AsyncMem0Client:
     try:
-        if not settings.MEM0_API_KEY:
+        if not api_key:
             raise ValueError("MEM0_API_KEY is required for hosted mem0 service")
         
-        client = MemoryClient(api_key=settings.MEM0_API_KEY)
+        client = AsyncMem0Client(api_key=api_key)
         
         logger.info("mem0 hosted client created successfully")
         return client
@@ -23,28 +84,42 @@ def create_mem0_client(settings: Settings) -> MemoryClient:
         raise Exception(f"mem0 client creation failed: {str(e)}")
 
 
-def get_mem0_client(settings: Settings) -> MemoryClient:
-    global _mem0_client
-    
-    if _mem0_client is None:
-        _mem0_client = create_mem0_client(settings)
-    
-    return _mem0_client
+@lru_cache(maxsize=1)
+def _shared_mem0_client(api_key: Optional[str]) -> AsyncMem0Client:
+    return create_mem0_client(api_key)
 
 
-def close_mem0_client():
-    global _mem0_client
-    
-    if _mem0_client:
-        _mem0_client = None
+def get_mem0_client(settings: Settings) -> AsyncMem0Client:
+    return _shared_mem0_client(settings.MEM0_API_KEY)
+
+
+async def close_mem0_client(settings: Settings):
+    if _shared_mem0_client.cache_info().currsize:
+        client = _shared_mem0_client(settings.MEM0_API_KEY)
+        _shared_mem0_client.cache_clear()
+        await client.aclose()
         logger.info("mem0 client connection closed")
 
 
 async def health_check_mem0(settings: Settings) -> bool:
-    try:
-        client = get_mem0_client(settings)
-        client.get_all(user_id="health_check", limit=1)
-        return True
-    except Exception as e:
-        logger.error(f"mem0 health check failed: {str(e)}")
-        return False
\ No newline at end of file
+    global _health_status
+    
+    if _health_status is not None and time.monotonic() - _health_status[0] < HEALTH_CHECK_TTL:
+        return _health_status[1]
+    
+    # One probe refreshes the cache; concurrent health checks wait for its result.
+    async with _health_lock:
+        now = time.monotonic()
+        if _health_status is not None and now - _health_status[0] < HEALTH_CHECK_TTL:
+            return _health_status[1]
+        
+        try:
+            client = get_mem0_client(settings)
+            await client.get_all(user_id="health_check", limit=1)
+            healthy = True
+        except Exception as e:
+            logger.error(f"mem0 health check failed: {str(e)}")
+            healthy = False
+        
+        _health_status = (now, healthy)
+        return healthy
\ No newline at end of file
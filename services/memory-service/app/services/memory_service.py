@@ -1,223 +1,246 @@
+import asyncio
 import logging
-from datetime import datetime
-from typing import List, Dict, Any
-from mem0 import MemoryClient
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
 
-from app.models.requests import MemoryStoreRequest, MemoryRetrieveRequest
-from app.models.responses import Memory, MemoryResponse, MemorySearchResponse
+from app.api.errors import (
+    UsernameRequiredError, LimitOutOfRangeError,
+    MemoryStoreError, MemorySearchError, MemoryGetError, MemoryDeleteError
+)
+from app.models.requests import MemoryStoreRequest, MemoryRetrieveRequest, MemoryBatchSearchRequest
+from app.models.responses import Memory, MemoryResponse, MemorySearchResponse, MemoryBatchSearchResponse
+from app.services.mem0_client import AsyncMem0Client, extract_memory_id
 
 logger = logging.getLogger(__name__)
 
+_BASE_METADATA = {"service": "memory-service"}
+
 
 class MemoryService:
     
-    def __init__(self, mem0_client: MemoryClient):
+    def __init__(self, mem0_client: AsyncMem0Client):
         self.mem0_client = mem0_client
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Task] = {}
         logger.info("MemoryService initialized")
     
+    async def _coalesced(self, key: Tuple[Any, ...], func: Callable[..., Awaitable[Any]], **kwargs: Any) -> Any:
+        # Concurrent identical reads share one mem0 round trip.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(func(**kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
     async def store_memory(self, request: MemoryStoreRequest) -> MemoryResponse:
         try:
-            if not request.username.strip():
-                raise ValueError("Username cannot be empty")
-            
-            if not request.message.strip():
-                raise ValueError("Message cannot be empty")
-            
-            logger.info(f"Storing memory for user: {request.username}")
-            
-            metadata = request.metadata or {}
-            metadata.update({
-                "stored_at": datetime.utcnow().isoformat(),
-                "username": request.username,
-                "service": "memory-service"
-            })
-            
-            try:
-                logger.debug(f"Calling mem0 add with user_id: {request.username}, message: {request.message}")
-                messages = [{"role": "user", "content": request.message.strip()}]
-                logger.debug(f"Messages to store: {messages}")
-                logger.debug(f"Metadata: {metadata}")
-                
-                result = self.mem0_client.add(
-                    messages=messages,
-                    user_id=request.username.strip(),
-                    metadata=metadata
-                )
-                
-                logger.debug(f"mem0 add result: {result}")
-                
-                if isinstance(result, list):
-                    logger.warning(f"Unexpected list response from mem0 add: {result}")
-                    if len(result) > 0 and isinstance(result[0], dict):
-                        memory_id = result[0].get("id", "unknown")
-                    else:
-                        memory_id = "unknown"
-                else:
-                    memory_id = result.get("id", "unknown") if result else "unknown"
-                    
-            except Exception as e:
-                logger.error(f"Error in mem0 add: {str(e)}", exc_info=True)
-                raise Exception(f"Failed to add memory to mem0: {str(e)}")
+            username = request.username
+            message = request.message
+            logger.info(f"Storing memory for user: {username}")
+            
+            stored_at = datetime.now(timezone.utc).isoformat()
+            metadata = {
+                **(request.metadata or {}),
+                "stored_at": stored_at,
+                "username": username,
+                **_BASE_METADATA
+            }
+            
+            messages = [{"role": "user", "content": message}]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Calling mem0 add with user_id: %s, message: %s", username, message)
+                logger.debug("Messages to store: %s", messages)
+                logger.debug("Metadata: %s", metadata)
+            
+            result = await self.mem0_client.add(
+                messages=messages,
+                user_id=username,
+                metadata=metadata
+            )
+            
+            logger.debug("mem0 add result: %s", result)
+            memory_id = extract_memory_id(result)
             
             if memory_id == "unknown":
-                logger.warning(f"Memory stored but ID not returned for user: {request.username}")
+                logger.warning(f"Memory stored but ID not returned for user: {username}")
             
-            logger.info(f"Memory stored successfully for user: {request.username}, ID: {memory_id}")
+            logger.info(f"Memory stored successfully for user: {username}, ID: {memory_id}")
             
-            return MemoryResponse(
+            return MemoryResponse.model_construct(
                 success=True,
                 message="Memory stored successfully",
                 data={
                     "memory_id": memory_id, 
-                    "username": request.username,
-                    "stored_at": metadata["stored_at"]
+                    "username": username,
+                    "stored_at": stored_at
                 }
             )
             
-        except ValueError as ve:
-            logger.error(f"Validation error for user {request.username}: {str(ve)}")
-            raise ve
         except Exception as e:
-            logger.error(f"Failed to store memory for user {request.username}: {str(e)}")
-            raise Exception(f"Failed to store memory: {str(e)}")
+            logger.error(f"Failed to store memory for user {request.username}: {str(e)}", exc_info=True)
+            raise MemoryStoreError(f"Failed to store memory: {str(e)}") from e
     
     async def retrieve_memories(self, request: MemoryRetrieveRequest) -> MemorySearchResponse:
         try:
-            if not request.username.strip():
-                raise ValueError("Username cannot be empty")
-            
-            if not request.query.strip():
-                raise ValueError("Query cannot be empty")
-            
-            if request.limit < 1 or request.limit > 20:
-                raise ValueError("Limit must be between 1 and 20")
-            
-            logger.info(f"Retrieving memories for user: {request.username} with query: {request.query}")
-            
-            try:
-                logger.debug(f"Calling mem0 search with query: {request.query}, user_id: {request.username}, limit: {request.limit}")
-                results = self.mem0_client.search(
-                    query=request.query.strip(),
-                    user_id=request.username.strip(),
-                    limit=request.limit
-                )
-                logger.debug(f"mem0 search results: {results}")
-                
-                memories = self._format_memories(results)
-                
-                logger.info(f"Retrieved {len(memories)} memories for user: {request.username}")
-                
-                return MemorySearchResponse(
-                    success=True,
-                    message=f"Found {len(memories)} memories for query: '{request.query}'",
-                    memories=memories,
-                    count=len(memories)
-                )
-                
-            except Exception as e:
-                logger.error(f"Error in mem0 search: {str(e)}", exc_info=True)
-                raise Exception(f"mem0 search failed: {str(e)}")
-            
-        except ValueError as ve:
-            logger.error(f"Validation error for user {request.username}: {str(ve)}")
-            raise ve
+            username = request.username
+            query = request.query
+            logger.info(f"Retrieving memories for user: {username} with query: {query}")
+            
+            logger.debug("Calling mem0 search with query: %s, user_id: %s, limit: %s", query, username, request.limit)
+            results = await self._coalesced(
+                ("search", username, query, request.limit),
+                self.mem0_client.search,
+                query=query,
+                user_id=username,
+                limit=request.limit
+            )
+            logger.debug("mem0 search results: %s", results)
+            
+            memories = self._format_memories(results)
+            
+            logger.info(f"Retrieved {len(memories)} memories for user: {username}")
+            
+            return MemorySearchResponse.model_construct(
+                success=True,
+                message=f"Found {len(memories)} memories for query: '{query}'",
+                memories=memories,
+                count=len(memories)
+            )
+            
         except Exception as e:
             logger.error(f"Failed to retrieve memories for user {request.username}", exc_info=True)
-            raise Exception(f"Failed to retrieve memories: {str(e)}")
+            raise MemorySearchError(f"Failed to retrieve memories: {str(e)}") from e
     
-    async def get_user_memories(self, username: str, limit: int = 10) -> MemorySearchResponse:
+    async def batch_retrieve(self, request: MemoryBatchSearchRequest) -> MemoryBatchSearchResponse:
+        logger.info(f"Running batch memory search with {len(request.queries)} queries")
+        
+        # Identical searches in one batch hit mem0 once.
+        unique: Dict[Tuple[str, str, int], MemoryRetrieveRequest] = {}
+        for query in request.queries:
+            unique.setdefault((query.username, query.query, query.limit), query)
+        
+        searched = await asyncio.gather(*(self._search_for_batch(query) for query in unique.values()))
+        by_key = dict(zip(unique, searched))
+        results = [by_key[(q.username, q.query, q.limit)] for q in request.queries]
+        
+        failed = sum(1 for result in results if not result.success)
+        
+        return MemoryBatchSearchResponse.model_construct(
+            success=failed == 0,
+            message=f"Completed {len(results)} searches ({failed} failed)",
+            results=results,
+            count=len(results)
+        )
+    
+    async def _search_for_batch(self, request: MemoryRetrieveRequest) -> MemorySearchResponse:
         try:
-            if not username.strip():
-                raise ValueError("Username cannot be empty")
+            results = await self._coalesced(
+                ("search", request.username, request.query, request.limit),
+                self.mem0_client.search,
+                query=request.query,
+                user_id=request.username,
+                limit=request.limit
+            )
+            
+            memories = self._format_memories(results)
             
-            if limit < 1 or limit > 50:
-                raise ValueError("Limit must be between 1 and 50")
+            return MemorySearchResponse.model_construct(
+                success=True,
+                message=f"Found {len(memories)} memories for query: '{request.query}'",
+                memories=memories,
+                count=len(memories)
+            )
             
-            username = username.strip()
+        except Exception as e:
+            logger.error(f"Batch search failed for user {request.username}: {str(e)}")
+            return MemorySearchResponse.model_construct(
+                success=False,
+                message=f"mem0 search failed: {str(e)}",
+                memories=[],
+                count=0
+            )
+    
+    async def get_user_memories(self, username: str, limit: int = 10) -> MemorySearchResponse:
+        username = username.strip()
+        if not username:
+            raise UsernameRequiredError(username=username)
+        
+        if limit < 1 or limit > 50:
+            raise LimitOutOfRangeError(limit=limit)
+        
+        try:
             logger.info(f"Getting all memories for user: {username}")
             
-            results = self.mem0_client.get_all(user_id=username, limit=limit)
+            results = await self._coalesced(
+                ("get_all", username, limit),
+                self.mem0_client.get_all,
+                user_id=username,
+                limit=limit
+            )
             
             memories = self._format_memories(results)
             
             logger.info(f"Retrieved {len(memories)} total memories for user: {username}")
             
-            return MemorySearchResponse(
+            return MemorySearchResponse.model_construct(
                 success=True,
                 message=f"Retrieved all memories for user: {username}",
                 memories=memories,
                 count=len(memories)
             )
             
-        except ValueError as ve:
-            logger.error(f"Validation error for user {username}: {str(ve)}")
-            raise ve
         except Exception as e:
             logger.error(f"Failed to get memories for user {username}: {str(e)}")
-            raise Exception(f"Failed to get user memories: {str(e)}")
+            raise MemoryGetError(f"Failed to get user memories: {str(e)}") from e
     
     async def delete_user_memories(self, username: str) -> MemoryResponse:
+        username = username.strip()
+        if not username:
+            raise UsernameRequiredError(username=username)
+        
         try:
-            if not username.strip():
-                raise ValueError("Username cannot be empty")
-            
-            username = username.strip()
             logger.info(f"Deleting all memories for user: {username}")
             
-            result = self.mem0_client.delete_all(user_id=username)
+            result = await self.mem0_client.delete_all(user_id=username)
             
             deleted_count = result.get("deleted_count", 0) if result else 0
             
             logger.info(f"Deleted {deleted_count} memories for user: {username}")
             
-            return MemoryResponse(
+            return MemoryResponse.model_construct(
                 success=True,
                 message=f"Deleted {deleted_count} memories for user: {username}",
                 data={
                     "deleted_count": deleted_count, 
                     "username": username,
-                    "deleted_at": datetime.utcnow().isoformat()
+                    "deleted_at": datetime.now(timezone.utc).isoformat()
                 }
             )
             
-        except ValueError as ve:
-            logger.error(f"Validation error for user {username}: {str(ve)}")
-            raise ve
         except Exception as e:
             logger.error(f"Failed to delete memories for user {username}: {str(e)}")
-            raise Exception(f"Failed to delete user memories: {str(e)}")
+            raise MemoryDeleteError(f"Failed to delete user memories: {str(e)}") from e
     
     def _format_memories(self, mem0_results: List[Dict[str, Any]]) -> List[Memory]:
-        memories = []
-        
         if not mem0_results:
             logger.info("No memories found in results")
-            return memories
+            return []
         
+        construct = Memory.model_construct
+        memories = []
+        append = memories.append
         for i, memory_data in enumerate(mem0_results):
-            try:
-                memory_id = memory_data.get("id", f"unknown_{i}")
-                memory_text = (
-                    memory_data.get("text") or 
-                    memory_data.get("content") or 
-                    memory_data.get("memory", "")
-                )
-                
-                if not memory_text:
-                    logger.warning(f"Empty memory text found in result {i}: {memory_data}")
-                    continue
-                
-                memory = Memory(
-                    id=memory_id,
-                    text=memory_text,
-                    score=memory_data.get("score"),
-                    metadata=memory_data.get("metadata", {})
-                )
-                memories.append(memory)
-                
-            except Exception as e:
-                logger.warning(f"Failed to format memory {i}: {memory_data}, error: {str(e)}")
+            get = memory_data.get
+            memory_text = get("text") or get("content") or get("memory")
+            if not memory_text:
+                logger.warning("Empty memory text found in result %d: %s", i, memory_data)
                 continue
+            append(construct(
+                id=get("id") or f"unknown_{i}",
+                text=memory_text,
+                score=get("score"),
+                metadata=get("metadata") or {}
+            ))
         
         logger.info(f"Successfully formatted {len(memories)} memories")
-        return memories
\ No newline at end of file
+        return memories